@@ -6,52 +6,100 @@ automated LLM-based trading decisions.
 
 Usage:
     python simple_automation.py --api-key YOUR_KEY
+
+Saved responses can be read back with `iter_responses(path)`, which yields
+one record per line of llm_responses.jsonl without loading the whole file.
 """
 
+import atexit
+import hashlib
 import json
+import logging
+import math
 import os
-import re
+import sys
+import time
 import argparse
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any
-import pandas as pd
+from typing import TYPE_CHECKING, BinaryIO, Dict, Iterable, Iterator, List, Any, Optional
+
+# numpy, openai and trading_script (which pulls in pandas and yfinance) are
+# imported where they are first used so `--help` and argument errors return quickly
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_openai: Any = None
+
+
+def _import_openai() -> Any:
+    """Import the openai package on first use and keep the module for later calls."""
+    global _openai
+    if _openai is None:
+        try:
+            import openai
+        except ImportError:
+            raise ImportError("openai package not installed. Run: pip install openai")
+        _openai = openai
+    return _openai
+
+
+# One client per process so repeated calls reuse its HTTP connection pool
+_openai_client: Any = None
+_openai_client_key: Optional[str] = None
+
 
-# Import existing trading functions
-from trading_script import (
-    process_portfolio, daily_results, load_latest_portfolio_state,
-    set_data_dir, PORTFOLIO_CSV, TRADE_LOG_CSV, last_trading_date
-)
+def _get_client(api_key: str) -> Any:
+    """Return the shared OpenAI client, creating it on first use or when the key changes."""
+    global _openai_client, _openai_client_key
+    if _openai_client is None or _openai_client_key != api_key:
+        if _openai_client is not None:
+            _openai_client.close()
+        _openai_client = _import_openai().OpenAI(api_key=api_key)
+        _openai_client_key = api_key
+    return _openai_client
 
+# Optional faster JSON backend; falls back to the stdlib
 try:
-    import openai
-    HAS_OPENAI = True
+    import orjson
+    HAS_ORJSON = True
 except ImportError:
-    HAS_OPENAI = False
+    HAS_ORJSON = False
 
 
-def generate_trading_prompt(portfolio_df: pd.DataFrame, cash: float, total_equity: float) -> str:
-    """Generate a trading prompt with current portfolio data"""
-    
-    # Format holdings
-    if portfolio_df.empty:
-        holdings_text = "No current holdings"
-    else:
-        holdings_text = portfolio_df.to_string(index=False)
-    
-    # Get current date
-    today = last_trading_date().date().isoformat()
-    
-    prompt = f"""You are a professional portfolio analyst. Here is your current portfolio state as of {today}:
+def _json_loads(text: str | bytes) -> Any:
+    """Parse JSON text (orjson.JSONDecodeError subclasses json.JSONDecodeError)."""
+    return orjson.loads(text) if HAS_ORJSON else json.loads(text)
 
-[ Holdings ]
-{holdings_text}
 
-[ Snapshot ]
-Cash Balance: ${cash:,.2f}
-Total Equity: ${total_equity:,.2f}
+def _json_line(obj: Any) -> bytes:
+    """Serialize `obj` as one newline-terminated UTF-8 JSON line."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj) + "\n").encode("utf-8")
+
+
+# Decodes one JSON value from an offset and reports where it ended
+_JSON_DECODER = json.JSONDecoder()
+
+# Top-level keys that mark a decoded object as the model's answer (or call_openai_api's
+# error reply) rather than a nested fragment such as a single trade
+_RESPONSE_KEYS = ("analysis", "trades", "error")
+
+
+def _is_llm_response(obj: Any) -> bool:
+    return isinstance(obj, dict) and any(k in obj for k in _RESPONSE_KEYS)
+
+# Fixed instructions and response schema, sent verbatim as the system message.
+# Keeping it byte-identical across runs lets the API's prompt-prefix cache hit.
+SYSTEM_PROMPT = """You are a professional portfolio analyst. Always respond with valid JSON in the exact format requested.
 
 Rules:
-- You have ${cash:,.2f} in cash available for new positions
+- Only spend the cash balance given in the portfolio state
 - Prefer U.S. micro-cap stocks (<$300M market cap)
 - Full shares only, no options or derivatives
 - Use stop-losses for risk management
@@ -60,44 +108,330 @@ Rules:
 Analyze the current market conditions and provide specific trading recommendations.
 
 Respond with ONLY a JSON object in this exact format:
-{{
+{
     "analysis": "Brief market analysis",
     "trades": [
-        {{
+        {
             "action": "buy",
             "ticker": "SYMBOL",
             "shares": 100,
             "price": 25.50,
             "stop_loss": 20.00,
             "reason": "Brief rationale"
-        }}
+        }
     ],
     "confidence": 0.8
-}}
+}
 
 Only recommend trades you are confident about. If no trades are recommended, use an empty trades array."""
+
+# Per-run portfolio state, sent as the user message after SYSTEM_PROMPT
+PROMPT_TEMPLATE = """Here is your current portfolio state as of {today}:
+
+[ Holdings ]
+{holdings_text}
+
+[ Snapshot ]
+Cash Balance: ${cash:,.2f}
+Total Equity: ${total_equity:,.2f}
+
+You have ${cash:,.2f} in cash available for new positions."""
+
+# Responses below this confidence are remembered: rerunning the same prompt skips the API call
+MIN_CONFIDENCE_THRESHOLD = 0.7
+
+
+# Append handle for llm_responses.jsonl, opened on first write and kept for the process
+_response_fh: Optional[BinaryIO] = None
+
+
+def _close_response_log() -> None:
+    global _response_fh
+    if _response_fh is not None:
+        _response_fh.close()
+        _response_fh = None
+
+
+atexit.register(_close_response_log)
+
+
+def append_response_log(path: Path, record: Dict[str, Any], durable: bool = False) -> None:
+    """Append one JSON line to `path`, reusing a buffered handle across calls.
+
+    The line is flushed to the OS every time; `durable=True` also fsyncs it to disk.
+    """
+    global _response_fh
+    if _response_fh is None or _response_fh.name != str(path):
+        _close_response_log()
+        _response_fh = open(path, "ab", buffering=64 * 1024)
+    _response_fh.write(_json_line(record))
+    _response_fh.flush()
+    if durable:
+        os.fsync(_response_fh.fileno())
+
+
+def last_response(path: Path, max_bytes: int = 256 * 1024) -> Optional[Dict[str, Any]]:
+    """Most recent record of a JSONL response log, reading only the file's tail; None if unavailable."""
+    try:
+        with open(path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(0, size - max_bytes))
+            tail = f.read().rstrip(b"\n")
+    except OSError:
+        return None
+    head, sep, line = tail.rpartition(b"\n")
+    if not sep and size > max_bytes:
+        return None  # last line is longer than the tail we read
+    try:
+        record = _json_loads(line)
+    except ValueError:
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def iter_responses(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield each record of a JSONL response log in order, skipping blank lines."""
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield _json_loads(line)
+
+
+@dataclass(slots=True, frozen=True)
+class Holding:
+    """One open position; the portfolio is a short list of these rather than a DataFrame."""
+    ticker: str
+    shares: float
+    stop_loss: float
+    buy_price: float
+    cost_basis: float
+
+
+# Numeric Holding fields, in declaration order
+HOLDING_FIELDS = ("shares", "stop_loss", "buy_price", "cost_basis")
+
+
+def _as_float(value: Any) -> float:
+    """Float value of `value`, or 0.0 when it is missing (None/NaN) or unparseable."""
+    try:
+        result = float(value) if value is not None else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+    return 0.0 if math.isnan(result) else result
+
+
+def _ticker(raw: Any) -> str:
+    """Normalized, interned ticker symbol, so repeated tickers share one string object."""
+    return sys.intern(str(raw or "").upper())
+
+
+def holdings_from_records(portfolio: Any) -> List[Holding]:
+    """Build holdings from a portfolio DataFrame or a list of row dicts."""
+    if hasattr(portfolio, "columns"):
+        # DataFrame: read whole columns instead of materializing a dict per row
+        columns = [
+            portfolio[c].tolist() if c in portfolio.columns else [None] * len(portfolio)
+            for c in ("ticker", *HOLDING_FIELDS)
+        ]
+        return [
+            Holding(_ticker(t), _as_float(sh), _as_float(sl), _as_float(bp), _as_float(cb))
+            for t, sh, sl, bp, cb in zip(*columns)
+        ]
+    records: Iterable[Dict[str, Any]] = portfolio
+    return [
+        Holding(
+            ticker=_ticker(r.get("ticker")),
+            shares=_as_float(r.get("shares")),
+            stop_loss=_as_float(r.get("stop_loss")),
+            buy_price=_as_float(r.get("buy_price")),
+            cost_basis=_as_float(r.get("cost_basis")),
+        )
+        for r in records
+    ]
+
+
+@dataclass(slots=True, frozen=True)
+class TradeRecord:
+    """One LLM-recommended order, with fields normalized and typed once after parsing."""
+    action: str
+    ticker: str
+    shares: float
+    price: float
+    stop_loss: float
+    reason: str
+
+
+def trades_from_response(trades: Any) -> List[TradeRecord]:
+    """Convert the response's "trades" array to TradeRecords; bad numbers become 0 (and fail validation)."""
+    if not isinstance(trades, list):
+        return []
+    records = []
+    for t in trades:
+        t = t if isinstance(t, dict) else {}
+        records.append(TradeRecord(
+            action=str(t.get("action") or "").lower(),
+            ticker=_ticker(t.get("ticker")),
+            shares=_as_float(t.get("shares")),
+            price=_as_float(t.get("price")),
+            stop_loss=_as_float(t.get("stop_loss")),
+            reason=str(t.get("reason") or "LLM recommendation"),
+        ))
+    return records
+
+
+def holdings_table(holdings: List[Holding]) -> "np.ndarray":
+    """Holdings as one structured array (ticker + numeric columns) for column-wise math."""
+    import numpy as np
     
+    width = max((len(h.ticker) for h in holdings), default=1)
+    dtype = [("ticker", f"U{width}")] + [(f, "f8") for f in HOLDING_FIELDS]
+    return np.array(
+        [(h.ticker, h.shares, h.stop_loss, h.buy_price, h.cost_basis) for h in holdings], dtype=dtype
+    )
+
+
+def validate_holdings(table: "np.ndarray") -> List[str]:
+    """Problems with the rows of a `holdings_table`, one message each; empty when all are valid."""
+    import numpy as np
+    
+    shares, buy_price, stop_loss = table["shares"], table["buy_price"], table["stop_loss"]
+    bad_shares = ~(shares > 0)
+    bad_buy = ~(buy_price > 0)
+    negative_stop = stop_loss < 0
+    # A stop of 0 means no stop-loss is set
+    stop_above_buy = (stop_loss > 0) & (stop_loss >= buy_price)
+    if not (bad_shares.any() or bad_buy.any() or negative_stop.any() or stop_above_buy.any()):
+        return []
+    
+    tickers = table["ticker"]
+    errors: List[str] = []
+    for i in np.flatnonzero(bad_shares):
+        errors.append(f"{tickers[i]}: shares must be positive (got {shares[i]})")
+    for i in np.flatnonzero(bad_buy):
+        errors.append(f"{tickers[i]}: buy_price must be positive (got {buy_price[i]})")
+    for i in np.flatnonzero(negative_stop):
+        errors.append(f"{tickers[i]}: stop_loss must not be negative (got {stop_loss[i]})")
+    for i in np.flatnonzero(stop_above_buy):
+        errors.append(f"{tickers[i]}: stop_loss {stop_loss[i]} must be below buy_price {buy_price[i]}")
+    return errors
+
+
+_HOLDINGS_HEADER = f"{'ticker':<8} {'shares':>10} {'stop_loss':>10} {'buy_price':>10} {'cost_basis':>12}"
+
+
+def format_holdings(holdings: List[Holding]) -> str:
+    """Render holdings as a fixed-width table."""
+    return "\n".join([_HOLDINGS_HEADER] + [
+        f"{h.ticker:<8} {h.shares:>10.2f} {h.stop_loss:>10.2f} {h.buy_price:>10.2f} {h.cost_basis:>12.2f}"
+        for h in holdings
+    ])
+
+
+@lru_cache(maxsize=1)
+def _today_iso(hour: int) -> str:
+    """Last trading date as YYYY-MM-DD; `hour` (epoch hours) lets a long-running process roll over."""
+    from trading_script import last_trading_date
+    return last_trading_date().date().isoformat()
+
+
+# Last prompt built, keyed on its inputs; retries within a session reuse it
+_prompt_memo: Dict[tuple, str] = {}
+
+
+def generate_trading_prompt(holdings: List[Holding], cash: float, total_equity: float) -> str:
+    """Generate a trading prompt with current portfolio data"""
+    
+    # Get current date
+    today = _today_iso(int(time.time() // 3600))
+    
+    key = (tuple(holdings), cash, total_equity, today)
+    cached = _prompt_memo.get(key)
+    if cached is not None:
+        return cached
+    
+    # Format holdings
+    if not holdings:
+        holdings_text = "No current holdings"
+    else:
+        holdings_text = format_holdings(holdings)
+    
+    prompt = PROMPT_TEMPLATE.format(
+        today=today,
+        holdings_text=holdings_text,
+        cash=cash,
+        total_equity=total_equity,
+    )
+    _prompt_memo.clear()
+    _prompt_memo[key] = prompt
     return prompt
 
 
+def stream_openai_response(prompt: str, api_key: str, model: str = "gpt-4") -> Iterator[str]:
+    """Yield response text as it streams in, closing the stream once the first JSON object is complete."""
+    client = _get_client(api_key)
+    stream = client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.3,
+        max_tokens=1500,
+        stream=True
+    )
+    
+    # Brace depth of the outermost {...}; braces inside JSON strings don't count.
+    # A balanced span only ends the stream if it decodes to the answer object, so
+    # prose like "the {holdings} above" or an example {"a": 1} is read past.
+    received: List[str] = []
+    offset = 0  # characters received before the current delta
+    start = 0   # offset of the current outermost "{"
+    depth = 0
+    in_string = escaped = False
+    try:
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content or ""
+            yield delta
+            received.append(delta)
+            for j, ch in enumerate(delta):
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif ch == "\\":
+                        escaped = True
+                    elif ch == '"':
+                        in_string = False
+                elif ch == "{":
+                    if depth == 0:
+                        start = offset + j
+                    depth += 1
+                elif depth and ch == '"':
+                    in_string = True
+                elif depth and ch == "}":
+                    depth -= 1
+                    if depth == 0 and _is_response_at("".join(received), start):
+                        return
+            offset += len(delta)
+    finally:
+        stream.close()
+
+
+def _is_response_at(text: str, start: int) -> bool:
+    """True if the model's answer object (see `_is_llm_response`) decodes from `text` at `start`."""
+    try:
+        return _is_llm_response(_JSON_DECODER.raw_decode(text, start)[0])
+    except json.JSONDecodeError:
+        return False
+
+
 def call_openai_api(prompt: str, api_key: str, model: str = "gpt-4") -> str:
     """Call OpenAI API and return response"""
-    if not HAS_OPENAI:
-        raise ImportError("openai package not installed. Run: pip install openai")
-    
-    client = openai.OpenAI(api_key=api_key)
-    
     try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": "You are a professional portfolio analyst. Always respond with valid JSON in the exact format requested."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=1500
-        )
-        return response.choices[0].message.content
+        return "".join(stream_openai_response(prompt, api_key, model))
+    except ImportError:
+        raise
     except Exception as e:
         return f'{{"error": "API call failed: {e}"}}'
 
@@ -105,68 +439,174 @@ def call_openai_api(prompt: str, api_key: str, model: str = "gpt-4") -> str:
 def parse_llm_response(response: str) -> Dict[str, Any]:
     """Parse LLM response and extract trading decisions"""
     try:
-        # Try to extract JSON from response
-        json_match = re.search(r'\{.*\}', response, re.DOTALL)
-        if json_match:
-            json_str = json_match.group()
-            return json.loads(json_str)
-        else:
-            return json.loads(response)
+        text = response.strip()
+        if text.startswith("{") and text.endswith("}"):
+            # Bare JSON reply: parse the whole thing (orjson when available)
+            try:
+                parsed = _json_loads(text)
+                if _is_llm_response(parsed):
+                    return parsed
+            except json.JSONDecodeError:
+                pass
+        # JSON wrapped in prose: decode at each "{" until an object with the response keys
+        # parses. A truncated reply must not yield one of its nested trades instead.
+        start = text.find("{")
+        while start >= 0:
+            try:
+                parsed = _JSON_DECODER.raw_decode(text, start)[0]
+                if _is_llm_response(parsed):
+                    return parsed
+            except json.JSONDecodeError:
+                pass
+            start = text.find("{", start + 1)
+        raise json.JSONDecodeError("No JSON object with 'analysis' or 'trades' found", text, 0)
     except json.JSONDecodeError as e:
         print(f"Failed to parse LLM response: {e}")
         print(f"Raw response: {response}")
         return {"error": "Failed to parse response", "raw_response": response}
 
 
-def execute_automated_trades(trades: List[Dict[str, Any]], portfolio_df: pd.DataFrame, cash: float) -> tuple[pd.DataFrame, float]:
+def prompt_hash(prompt: str, model: str) -> str:
+    """Stable key for a model + system prompt + user prompt combination."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in (model, SYSTEM_PROMPT, prompt):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def load_dryrun_cache(path: Path) -> Dict[str, str]:
+    """Read the dry-run response cache (prompt hash -> raw response), or {} if absent or unreadable."""
+    try:
+        data = _json_loads(path.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_dryrun_cache(path: Path, cache: Dict[str, str]) -> None:
+    """Write the dry-run response cache."""
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(orjson.dumps(cache) if HAS_ORJSON else json.dumps(cache).encode("utf-8"))
+    os.replace(tmp, path)
+
+
+# Order codes for _apply_trades
+BUY, SELL, SKIP = 1, -1, 0
+
+
+def _apply_trades(codes: "np.ndarray", amounts: "np.ndarray", cash: float) -> tuple[float, "np.ndarray", "np.ndarray"]:
+    """Cash accounting for a batch of validated orders (codes BUY/SELL/SKIP, amounts = shares * price).
+
+    Returns (final cash, accepted mask, cash balance after each order). Buys that
+    would overdraw are rejected and leave the balance unchanged.
+    """
+    import numpy as np
+    
+    is_buy = codes == BUY
+    deltas = np.where(is_buy, -amounts, np.where(codes == SELL, amounts, 0.0))
+    # Running balance if every order went through; exact until the first overdraw
+    balances = np.cumsum(np.concatenate(([cash], deltas)))[1:]
+    accepted = codes != SKIP
+    overdrawn = is_buy & (balances < 0)
+    if overdrawn.any():
+        # From the first overdraw on, a rejected buy changes later balances, so walk sequentially
+        k = int(overdrawn.argmax())
+        balance = float(balances[k - 1]) if k else cash
+        for i in range(k, len(codes)):
+            if codes[i] == BUY:
+                if amounts[i] <= balance:
+                    balance -= amounts[i]
+                else:
+                    accepted[i] = False
+            elif codes[i] == SELL:
+                balance += amounts[i]
+            balances[i] = balance
+    final_cash = float(balances[-1]) if len(balances) else cash
+    return final_cash, accepted, balances
+
+
+def execute_automated_trades(trades: List[TradeRecord], holdings: List[Holding], cash: float) -> tuple[List[Holding], float]:
     """Execute trades recommended by LLM"""
+    import numpy as np
+    
+    # Collect the report and write it in one call rather than a locked, flushed print per line
+    lines = [f"\n=== Executing {len(trades)} LLM-recommended trades ==="]
+    out = lines.append
     
-    print(f"\n=== Executing {len(trades)} LLM-recommended trades ===")
+    # Validate every trade in one vectorized pass
+    n = len(trades)
+    shares_arr = np.fromiter((t.shares for t in trades), dtype=float, count=n)
+    price_arr = np.fromiter((t.price for t in trades), dtype=float, count=n)
+    actions = [t.action for t in trades]
+    tickers = [t.ticker for t in trades]
+    has_ticker = np.fromiter(map(bool, tickers), dtype=bool, count=n)
+    valid = (shares_arr > 0) & (price_arr > 0) & has_ticker
+    amounts = shares_arr * price_arr
+    held = frozenset(h.ticker for h in holdings)
     
-    for trade in trades:
-        action = trade.get('action', '').lower()
-        ticker = trade.get('ticker', '').upper()
-        shares = float(trade.get('shares', 0))
-        price = float(trade.get('price', 0))
-        stop_loss = float(trade.get('stop_loss', 0))
-        reason = trade.get('reason', 'LLM recommendation')
+    codes = np.fromiter(
+        (BUY if a == 'buy' else SELL if a == 'sell' and t in held else SKIP for a, t in zip(actions, tickers)),
+        dtype=np.int8, count=n,
+    )
+    codes[~valid] = SKIP
+    cash, accepted, balances = _apply_trades(codes, amounts, cash)
+    
+    for i, trade in enumerate(trades):
+        action, ticker, shares, price, reason = trade.action, trade.ticker, trade.shares, trade.price, trade.reason
         
         if action == 'buy':
-            if shares > 0 and price > 0 and ticker:
-                cost = shares * price
-                if cost <= cash:
-                    print(f"BUY: {shares} shares of {ticker} at ${price:.2f} (stop: ${stop_loss:.2f}) - {reason}")
+            if valid[i]:
+                cost = float(amounts[i])
+                if accepted[i]:
+                    out(f"BUY: {shares:g} shares of {ticker} at ${price:.2f} (stop: ${trade.stop_loss:.2f}) - {reason}")
                     # Here you would call the actual buy function from trading_script
                     # For now, just simulate the trade
-                    cash -= cost
-                    print(f"  Simulated: Cash reduced by ${cost:.2f}, new balance: ${cash:.2f}")
+                    out(f"  Simulated: Cash reduced by ${cost:.2f}, new balance: ${balances[i]:.2f}")
                 else:
-                    print(f"BUY REJECTED: {ticker} - Insufficient cash (need ${cost:.2f}, have ${cash:.2f})")
+                    out(f"BUY REJECTED: {ticker} - Insufficient cash (need ${cost:.2f}, have ${balances[i]:.2f})")
             else:
-                print(f"INVALID BUY ORDER: {trade}")
+                out(f"INVALID BUY ORDER: {trade}")
         
         elif action == 'sell':
-            if shares > 0 and price > 0 and ticker:
-                proceeds = shares * price
-                print(f"SELL: {shares} shares of {ticker} at ${price:.2f} - {reason}")
+            if valid[i] and ticker not in held:
+                out(f"SELL REJECTED: {ticker} - Not in current holdings")
+            elif valid[i]:
+                proceeds = float(amounts[i])
+                out(f"SELL: {shares:g} shares of {ticker} at ${price:.2f} - {reason}")
                 # Here you would call the actual sell function from trading_script
                 # For now, just simulate the trade
-                cash += proceeds
-                print(f"  Simulated: Cash increased by ${proceeds:.2f}, new balance: ${cash:.2f}")
+                out(f"  Simulated: Cash increased by ${proceeds:.2f}, new balance: ${balances[i]:.2f}")
             else:
-                print(f"INVALID SELL ORDER: {trade}")
+                out(f"INVALID SELL ORDER: {trade}")
         
         elif action == 'hold':
-            print(f"HOLD: {ticker} - {reason}")
+            out(f"HOLD: {ticker} - {reason}")
         
         else:
-            print(f"UNKNOWN ACTION: {action} for {ticker}")
+            out(f"UNKNOWN ACTION: {action} for {ticker}")
     
-    return portfolio_df, cash
+    print("\n".join(lines))
+    return holdings, cash
+
 
+def _has_portfolio_rows(path: Path) -> bool:
+    """True if the portfolio CSV exists and holds at least one row past the header.
 
-def run_automated_trading(api_key: str, model: str = "gpt-4", data_dir: str = "Start Your Own", dry_run: bool = False):
+    A header-only file (as shipped in "Start Your Own") would make the loader
+    prompt for starting cash, which automation must never do.
+    """
+    try:
+        with path.open("r", encoding="utf-8") as fh:
+            next(fh, None)
+            return any(line.strip() for line in fh)
+    except FileNotFoundError:
+        return False
+
+
+def run_automated_trading(api_key: str, model: str = "gpt-4", data_dir: str = "Start Your Own", dry_run: bool = False, durable: bool = False, force: bool = False):
     """Run the automated trading process"""
+    from trading_script import load_latest_portfolio_state, set_data_dir
     
     print("=== Automated Trading System ===")
     
@@ -176,26 +616,60 @@ def run_automated_trading(api_key: str, model: str = "gpt-4", data_dir: str = "S
     
     # Load current portfolio
     portfolio_file = data_path / "chatgpt_portfolio_update.csv"
-    if portfolio_file.exists():
-        portfolio_df, cash = load_latest_portfolio_state(str(portfolio_file))
+    if _has_portfolio_rows(portfolio_file):
+        portfolio, cash = load_latest_portfolio_state()
+        holdings = holdings_from_records(portfolio)
     else:
-        portfolio_df = pd.DataFrame(columns=["ticker", "shares", "stop_loss", "buy_price", "cost_basis"])
+        holdings = []
         cash = 10000.0  # Default starting cash
     
-    # Calculate total equity (simplified)
-    total_value = portfolio_df['cost_basis'].sum() if not portfolio_df.empty and 'cost_basis' in portfolio_df.columns else 0.0
+    # Calculate total equity (simplified); a fresh account has nothing to validate or sum
+    total_value = 0.0
+    if holdings:
+        table = holdings_table(holdings)
+        for problem in validate_holdings(table):
+            print(f"WARNING: {problem}")
+        total_value = float(table["cost_basis"].sum())
     total_equity = cash + total_value
     
     print(f"Portfolio loaded: ${cash:,.2f} cash, ${total_equity:,.2f} total equity")
     
     # Generate prompt
-    prompt = generate_trading_prompt(portfolio_df, cash, total_equity)
+    prompt = generate_trading_prompt(holdings, cash, total_equity)
     print(f"\nGenerated prompt ({len(prompt)} characters)")
+    logger.debug("prompt:\n%s", prompt)
     
-    # Call LLM
-    print("Calling LLM for trading recommendations...")
-    response = call_openai_api(prompt, api_key, model)
-    print(f"Received response ({len(response)} characters)")
+    key = prompt_hash(prompt, model)
+    response_file = data_path / "llm_responses.jsonl"
+    
+    # Same prompt and mode (dry/live) as the last run, which came back below the
+    # confidence bar: don't ask again unless forced
+    last = None if force else last_response(response_file)
+    # Only a complete answer with a real numeric confidence counts; a missing value is not 0
+    last_answer = last.get("response") if last else None
+    last_confidence = last_answer.get("confidence") if isinstance(last_answer, dict) else None
+    if (last and last.get("prompt_hash") == key and last.get("dry_run") == dry_run
+            and "trades" in last_answer
+            and isinstance(last_confidence, (int, float)) and not isinstance(last_confidence, bool)
+            and not math.isnan(last_confidence)):
+        if last_confidence < MIN_CONFIDENCE_THRESHOLD:
+            print(f"Last response for this prompt had low confidence ({last_confidence:.1%}); skipping LLM call (use --force to ask again)")
+            print("No trades recommended")
+            return
+    
+    # Dry runs reuse the last response for an identical prompt instead of calling the API again
+    cache_file = data_path / "dryrun_cache.json"
+    cache = load_dryrun_cache(cache_file) if dry_run else {}
+    response = cache.get(key)
+    
+    if response is not None:
+        print("Using cached LLM response for this prompt (dry run)")
+    else:
+        # Call LLM
+        print("Calling LLM for trading recommendations...")
+        response = call_openai_api(prompt, api_key, model)
+        print(f"Received response ({len(response)} characters)")
+    logger.debug("response:\n%s", response)
     
     # Parse response
     parsed_response = parse_llm_response(response)
@@ -204,10 +678,14 @@ def run_automated_trading(api_key: str, model: str = "gpt-4", data_dir: str = "S
         print(f"Error: {parsed_response['error']}")
         return
     
+    if dry_run and key not in cache:
+        cache[key] = response
+        save_dryrun_cache(cache_file, cache)
+    
     # Display analysis
     analysis = parsed_response.get('analysis', 'No analysis provided')
     confidence = parsed_response.get('confidence', 0.0)
-    trades = parsed_response.get('trades', [])
+    trades = trades_from_response(parsed_response.get('trades', []))
     
     print(f"\n=== LLM Analysis ===")
     print(f"Analysis: {analysis}")
@@ -216,22 +694,23 @@ def run_automated_trading(api_key: str, model: str = "gpt-4", data_dir: str = "S
     
     # Execute trades
     if trades and not dry_run:
-        portfolio_df, cash = execute_automated_trades(trades, portfolio_df, cash)
+        holdings, cash = execute_automated_trades(trades, holdings, cash)
     elif trades and dry_run:
-        print(f"\n=== DRY RUN - Would execute {len(trades)} trades ===")
-        for trade in trades:
-            print(f"  {trade.get('action', 'unknown').upper()}: {trade.get('shares', 0)} shares of {trade.get('ticker', 'unknown')} at ${trade.get('price', 0):.2f}")
+        print("\n".join([f"\n=== DRY RUN - Would execute {len(trades)} trades ==="] + [
+            f"  {(trade.action or 'unknown').upper()}: {trade.shares:g} shares of {trade.ticker or 'unknown'} at ${trade.price:.2f}"
+            for trade in trades
+        ]))
     else:
         print("No trades recommended")
     
     # Save the LLM response for review
-    response_file = data_path / "llm_responses.jsonl"
-    with open(response_file, "a") as f:
-        f.write(json.dumps({
-            "timestamp": pd.Timestamp.now().isoformat(),
-            "response": parsed_response,
-            "raw_response": response
-        }) + "\n")
+    append_response_log(response_file, {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="microseconds"),
+        "prompt_hash": key,
+        "dry_run": dry_run,
+        "response": parsed_response,
+        "raw_response": response
+    }, durable=durable)
     
     print(f"\n=== Analysis Complete ===")
     print(f"Response saved to: {response_file}")
@@ -244,9 +723,21 @@ def main():
     parser.add_argument("--model", default="gpt-4", help="OpenAI model to use")
     parser.add_argument("--data-dir", default="Start Your Own", help="Data directory")
     parser.add_argument("--dry-run", action="store_true", help="Don't execute trades, just show recommendations")
+    parser.add_argument("--durable", action="store_true", help="fsync the response log after each write")
+    parser.add_argument("--force", action="store_true", help="Call the LLM even if the same prompt last came back low-confidence")
+    parser.add_argument("--log-level", default="WARNING",
+                       choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+                       help="Logging level for this script (default: WARNING)")
     
     args = parser.parse_args()
     
+    # Root stays at WARNING so trading_script/openai/httpx chatter doesn't leak into the output
+    logging.basicConfig(
+        level=logging.WARNING,
+        format=' %(asctime)s - %(filename)s:%(lineno)d - %(levelname)s - %(message)s'
+    )
+    logger.setLevel(getattr(logging, args.log_level.upper()))
+    
     # Get API key
     api_key = args.api_key or os.getenv("OPENAI_API_KEY")
     if not api_key:
@@ -258,7 +749,9 @@ def main():
         api_key=api_key,
         model=args.model,
         data_dir=args.data_dir,
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        durable=args.durable,
+        force=args.force
     )
 
 
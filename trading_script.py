@@ -16,11 +16,17 @@ Notes:
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, cast,Dict, List, Optional
+from typing import Any, Callable, cast,Dict, List, Optional
+import atexit
 import os
+import random
+import threading
+import time
 import warnings
 
 import numpy as np
@@ -36,6 +42,13 @@ try:
 except Exception:
     _HAS_PDR = False
 
+# Optional faster JSON backend; falls back to the stdlib
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
 # -------- AS-OF override --------
 ASOF_DATE: pd.Timestamp | None = None
 
@@ -99,10 +112,13 @@ def _read_json_file(path: Path) -> Optional[Dict]:
     """
     try:
         logger.info("Reading JSON file: %s", path)
-        with path.open("r", encoding="utf-8") as fh:
-            result = json.load(fh)
-            logger.info("Successfully read JSON file: %s", path)
-            return result
+        if _HAS_ORJSON:
+            result = orjson.loads(path.read_bytes())
+        else:
+            with path.open("r", encoding="utf-8") as fh:
+                result = json.load(fh)
+        logger.info("Successfully read JSON file: %s", path)
+        return result
     except FileNotFoundError:
         logger.info("JSON file not found: %s", path)
         return None
@@ -127,8 +143,18 @@ def load_benchmarks(script_dir: Path | None = None) -> List[str]:
     - If file missing or malformed -> return DEFAULT_BENCHMARKS copy.
     - If 'benchmarks' key missing or not a list -> log warning and return defaults.
     - Normalizes tickers (strip, upper) and preserves order while removing duplicates.
+    - Cached per directory for the life of the process; call `refresh_benchmarks()`
+      after editing tickers.json mid-run.
     """
     base = Path(script_dir) if script_dir else SCRIPT_DIR
+    return list(_load_benchmarks_cached(base))
+
+def refresh_benchmarks() -> None:
+    """Drop cached tickers.json contents so the next `load_benchmarks()` re-reads the file."""
+    _load_benchmarks_cached.cache_clear()
+
+@lru_cache(maxsize=8)
+def _load_benchmarks_cached(base: Path) -> tuple[str, ...]:
     candidates = [base, base.parent]
 
     cfg = None
@@ -142,26 +168,18 @@ def load_benchmarks(script_dir: Path | None = None) -> List[str]:
             break
 
     if not cfg:
-        return DEFAULT_BENCHMARKS.copy()
+        return tuple(DEFAULT_BENCHMARKS)
 
     benchmarks = cfg.get("benchmarks")
     if not isinstance(benchmarks, list):
         logger.warning("tickers.json at %s missing 'benchmarks' array. Falling back to defaults.", cfg_path)
-        return DEFAULT_BENCHMARKS.copy()
+        return tuple(DEFAULT_BENCHMARKS)
 
-    seen = set()
-    result: list[str] = []
-    for t in benchmarks:
-        if not isinstance(t, str):
-            continue
-        up = t.strip().upper()
-        if not up:
-            continue
-        if up not in seen:
-            seen.add(up)
-            result.append(up)
-
-    return result if result else DEFAULT_BENCHMARKS.copy()
+    # dict.fromkeys dedups while keeping the file's order
+    result = tuple(dict.fromkeys(
+        up for up in (t.strip().upper() for t in benchmarks if isinstance(t, str)) if up
+    ))
+    return result if result else tuple(DEFAULT_BENCHMARKS)
 
 
 # ------------------------------
@@ -206,6 +224,71 @@ STOOQ_MAP = {
 # Symbols we should *not* attempt on Stooq
 STOOQ_BLOCKLIST = {"^RUT"}
 
+@lru_cache(maxsize=None)
+def _stooq_symbol(ticker: str, csv: bool = False) -> str:
+    """Map a Yahoo-style ticker to Stooq's symbol (lowercase; the CSV endpoint also wants `.us` on equities)."""
+    t = STOOQ_MAP.get(ticker, ticker)
+    if t.startswith("^"):
+        return t.lower() if csv else t
+    sym = t.lower()
+    if csv and not sym.endswith(".us"):
+        sym = f"{sym}.us"
+    return sym
+
+# Yahoo ETF proxies for indices when no source has the index itself
+PROXY_MAP = {"^GSPC": "SPY", "^RUT": "IWM"}
+
+# Shared HTTP session for Stooq requests (CSV and pandas-datareader), created on first use
+_HTTP_SESSION: Any = None
+
+def _http_session() -> Any:
+    """Return a process-wide requests.Session with a sized, retrying keep-alive pool."""
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[500, 502, 503, 504],  # 429 is handled by _http_get
+                allowed_methods=["GET"],
+            ),
+        )
+        session.mount("https://", adapter)
+        session.headers.update({"User-Agent": "ChatGPT-Micro-Cap/1.0", "Accept-Encoding": "gzip"})
+        # Keep the pool warm for the life of the process; close it only on exit
+        atexit.register(session.close)
+        _HTTP_SESSION = session
+    return _HTTP_SESSION
+
+# Backoff schedule for HTTP 429 (rate-limited) responses
+HTTP_MAX_ATTEMPTS = 4
+HTTP_BACKOFF_BASE = 1.0    # seconds
+HTTP_BACKOFF_CAP = 60.0    # seconds
+HTTP_BACKOFF_JITTER = 0.5  # seconds
+
+def _http_get(url: str, timeout: float = 10) -> Any:
+    """GET `url` via the shared session, backing off exponentially (with jitter) on HTTP 429."""
+    session = _http_session()
+    for attempt in range(HTTP_MAX_ATTEMPTS):
+        r = session.get(url, timeout=timeout)
+        if r.status_code != 429 or attempt == HTTP_MAX_ATTEMPTS - 1:
+            return r
+        try:
+            delay = float(r.headers.get("Retry-After", ""))
+        except ValueError:
+            delay = HTTP_BACKOFF_BASE * 2 ** attempt + random.uniform(0, HTTP_BACKOFF_JITTER)
+        delay = min(delay, HTTP_BACKOFF_CAP)
+        logger.info("Rate limited by %s (HTTP 429); retrying in %.1fs", url, delay)
+        time.sleep(delay)
+    return r
+
 
 # ------------------------------
 # Data access layer (UPDATED)
@@ -240,16 +323,22 @@ def _normalize_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
             df = df.copy()
             df.columns = ["_".join(map(str, t)).strip("_") for t in df.columns.to_flat_index()]
             
-    # Ensure all expected columns exist
+    # Ensure all expected columns exist (one hash set instead of an Index lookup per column)
+    present = set(df.columns)
     for c in ["Open", "High", "Low", "Close", "Volume"]:
-        if c not in df.columns:
+        if c not in present:
             df[c] = np.nan
-    if "Adj Close" not in df.columns:
+    if "Adj Close" not in present:
         df["Adj Close"] = df["Close"]
     cols = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
     return df[cols]
 
-def _yahoo_download(ticker: str, **kwargs: Any) -> pd.DataFrame:
+# yf.download keeps per-call state in module globals, and we swap sys.stdout/stderr and
+# warning filters around it, so only one call may run at a time. Stooq fetches are free
+# to overlap with it.
+_YF_LOCK = threading.Lock()
+
+def _yahoo_download(ticker: str | list[str], **kwargs: Any) -> pd.DataFrame:
     """Call yfinance.download with a real UA and silence all chatter."""
     import io, logging
     from contextlib import redirect_stderr, redirect_stdout
@@ -259,7 +348,7 @@ def _yahoo_download(ticker: str, **kwargs: Any) -> pd.DataFrame:
 
     logging.getLogger("yfinance").setLevel(logging.CRITICAL)
     buf = io.StringIO()
-    with warnings.catch_warnings():
+    with _YF_LOCK, warnings.catch_warnings():
         warnings.simplefilter("ignore")
         try:
             with redirect_stdout(buf), redirect_stderr(buf):
@@ -268,32 +357,37 @@ def _yahoo_download(ticker: str, **kwargs: Any) -> pd.DataFrame:
             return pd.DataFrame()
     return df if isinstance(df, pd.DataFrame) else pd.DataFrame()
 
+# Stooq answers HTTP 200 with this text once the daily quota is used up. Waiting won't
+# help, so after seeing it we stop calling the CSV endpoint for the rest of the run.
+_STOOQ_QUOTA_MARKER = b"Exceeded the daily hits limit"
+_STOOQ_QUOTA_EXHAUSTED = False
+
 def _stooq_csv_download(ticker: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
     """Fetch OHLCV from Stooq CSV endpoint (daily). Good for US tickers and many ETFs."""
-    import requests, io
-    if ticker in STOOQ_BLOCKLIST:
+    global _STOOQ_QUOTA_EXHAUSTED
+    import io
+    if ticker in STOOQ_BLOCKLIST or _STOOQ_QUOTA_EXHAUSTED:
         return pd.DataFrame()
-    t = STOOQ_MAP.get(ticker, ticker)
 
     # Stooq daily CSV: lowercase; equities/ETFs use .us, indices keep ^ prefix
-    if not t.startswith("^"):
-        sym = t.lower()
-        if not sym.endswith(".us"):
-            sym = f"{sym}.us"
-    else:
-        sym = t.lower()
-
-    url = f"https://stooq.com/q/d/l/?s={sym}&i=d"
+    sym = _stooq_symbol(ticker, csv=True)
+    # Ask only for the window we need (d1/d2 are inclusive) instead of the full history
+    d1 = start.strftime("%Y%m%d")
+    d2 = (end - pd.Timedelta(days=1)).strftime("%Y%m%d")
+    url = f"https://stooq.com/q/d/l/?s={sym}&d1={d1}&d2={d2}&i=d"
     try:
-        r = requests.get(url, timeout=10)
-        if r.status_code != 200 or not r.text.strip():
+        r = _http_get(url, timeout=10)
+        if r.status_code != 200 or not r.content.strip():
+            return pd.DataFrame()
+        if r.content.startswith(_STOOQ_QUOTA_MARKER):
+            logger.warning("Stooq daily request limit reached; skipping Stooq CSV for the rest of this run.")
+            _STOOQ_QUOTA_EXHAUSTED = True
             return pd.DataFrame()
-        df = pd.read_csv(io.StringIO(r.text))
+        # Parse the raw bytes straight into a date-indexed frame (no text decode, no second pass)
+        df = pd.read_csv(io.BytesIO(r.content), index_col="Date", parse_dates=["Date"])
         if df.empty:
             return pd.DataFrame()
 
-        df["Date"] = pd.to_datetime(df["Date"])
-        df.set_index("Date", inplace=True)
         df.sort_index(inplace=True)
 
         # Filter to [start, end) (Stooq end is exclusive)
@@ -315,16 +409,14 @@ def _stooq_download(
     if not _HAS_PDR or ticker in STOOQ_BLOCKLIST:
         return pd.DataFrame()
 
-    t = STOOQ_MAP.get(ticker, ticker)
-    if not t.startswith("^"):
-        t = t.lower()
+    t = _stooq_symbol(ticker)
 
     try:
         # Ensure pdr is imported locally if not available globally
         if not _HAS_PDR:
             return pd.DataFrame()
         import pandas_datareader.data as pdr_local
-        df = cast(pd.DataFrame, pdr_local.DataReader(t, "stooq", start=start, end=end))
+        df = cast(pd.DataFrame, pdr_local.DataReader(t, "stooq", start=start, end=end, session=_http_session()))
         df.sort_index(inplace=True)
         return df
     except Exception:
@@ -354,15 +446,74 @@ def _weekend_safe_range(period: str | None, start: Any, end: Any) -> tuple[pd.Ti
     end_ts = (end_trading + pd.Timedelta(days=1)).normalize()
     return start_ts, end_ts
 
-def download_price_data(ticker: str, **kwargs: Any) -> FetchResult:
+# In-process cache of successful fetches: {(ticker, start, end, auto_adjust): (expires_at, FetchResult)}
+# Windows that end before today are settled history and can be kept much longer
+# than ones that still include the current (possibly live) session.
+PRICE_CACHE_TTL_OPEN = 60.0        # seconds
+PRICE_CACHE_TTL_CLOSED = 86400.0   # seconds
+_PRICE_CACHE: dict[tuple[Any, ...], tuple[float, FetchResult]] = {}
+
+def _canon_ticker(ticker: str) -> str:
+    """Canonical form of a user-supplied ticker (' $aapl' -> 'AAPL') so spelling variants share one cache slot."""
+    return str(ticker).strip().upper().lstrip("$")
+
+def _cache_key(ticker: str, s: pd.Timestamp, e: pd.Timestamp, kwargs: dict[str, Any]) -> tuple[Any, ...]:
+    return (ticker, s, e, kwargs.get("auto_adjust"))
+
+def _cache_get(key: tuple[Any, ...]) -> FetchResult | None:
+    hit = _PRICE_CACHE.get(key)
+    if hit is None:
+        return None
+    expires_at, result = hit
+    if time.monotonic() >= expires_at:
+        del _PRICE_CACHE[key]
+        return None
+    return FetchResult(result.df.copy(), result.source)
+
+def _cache_put(key: tuple[Any, ...], result: FetchResult) -> None:
+    # Only cache real data so a transient outage is retried on the next call
+    if result.df.empty:
+        return
+    end = key[2]
+    closed = end <= pd.Timestamp(_effective_now()).normalize()
+    ttl = PRICE_CACHE_TTL_CLOSED if closed else PRICE_CACHE_TTL_OPEN
+    _PRICE_CACHE[key] = (time.monotonic() + ttl, FetchResult(result.df.copy(), result.source))
+
+def _fetch_with_fallbacks(ticker: str, s: pd.Timestamp, e: pd.Timestamp, **kwargs: Any) -> FetchResult:
     """
-    Robust OHLCV fetch with multi-stage fallbacks:
+    Multi-stage OHLCV fetch over the window [s, e).
 
     Order:
       1) Yahoo Finance via yfinance
       2) Stooq via pandas-datareader
       3) Stooq direct CSV
       4) Index proxies (e.g., ^GSPC->SPY, ^RUT->IWM) via Yahoo
+    """
+    stages: list[tuple[str, Callable[[], pd.DataFrame]]] = [
+        ("yahoo", lambda: _yahoo_download(ticker, start=s, end=e, **kwargs)),  # 1) date-bounded
+        ("stooq-pdr", lambda: _stooq_download(ticker, start=s, end=e)),       # 2)
+        ("stooq-csv", lambda: _stooq_csv_download(ticker, s, e)),             # 3)
+    ]
+    proxy = PROXY_MAP.get(ticker)
+    if proxy:
+        stages.append((f"yahoo:{proxy}-proxy", lambda: _yahoo_download(proxy, start=s, end=e, **kwargs)))  # 4)
+
+    for source, fetch in stages:
+        df = fetch()
+        if isinstance(df, pd.DataFrame) and not df.empty:
+            return FetchResult(_normalize_ohlcv(_to_datetime_index(df)), source)
+
+    # Nothing worked
+    empty = pd.DataFrame(columns=["Open", "High", "Low", "Close", "Adj Close", "Volume"])
+    return FetchResult(empty, "empty")
+
+def download_price_data(ticker: str, **kwargs: Any) -> FetchResult:
+    """
+    Robust OHLCV fetch with multi-stage fallbacks (see `_fetch_with_fallbacks`).
+
+    Successful results are cached in-process (PRICE_CACHE_TTL_OPEN seconds for
+    windows that include today, PRICE_CACHE_TTL_CLOSED for settled history), so
+    repeat requests for the same ticker and window skip the network.
     Returns a DataFrame with columns [Open, High, Low, Close, Adj Close, Volume].
     """
     # Pull out range args, compute a weekend-safe window
@@ -373,34 +524,115 @@ def download_price_data(ticker: str, **kwargs: Any) -> FetchResult:
     kwargs.setdefault("threads", False)
 
     s, e = _weekend_safe_range(period, start, end)
+    ticker = _canon_ticker(ticker)
 
-    # ---------- 1) Yahoo (date-bounded) ----------
-    df_y = _yahoo_download(ticker, start=s, end=e, **kwargs)
-    if isinstance(df_y, pd.DataFrame) and not df_y.empty:
-        return FetchResult(_normalize_ohlcv(_to_datetime_index(df_y)), "yahoo")
+    key = _cache_key(ticker, s, e, kwargs)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
 
-    # ---------- 2) Stooq via pandas-datareader ----------
-    df_s = _stooq_download(ticker, start=s, end=e)
-    if isinstance(df_s, pd.DataFrame) and not df_s.empty:
-        return FetchResult(_normalize_ohlcv(_to_datetime_index(df_s)), "stooq-pdr")
+    result = _fetch_with_fallbacks(ticker, s, e, **kwargs)
+    _cache_put(key, result)
+    return result
 
-    # ---------- 3) Stooq direct CSV ----------
-    df_csv = _stooq_csv_download(ticker, s, e)
-    if isinstance(df_csv, pd.DataFrame) and not df_csv.empty:
-        return FetchResult(_normalize_ohlcv(_to_datetime_index(df_csv)), "stooq-csv")
+def _batch_slice(batch: pd.DataFrame, ticker: str) -> pd.DataFrame:
+    """Pull one ticker's columns out of a grouped multi-ticker yfinance frame."""
+    if batch.empty or not isinstance(batch.columns, pd.MultiIndex):
+        return pd.DataFrame()
+    if ticker not in batch.columns.get_level_values(0):
+        return pd.DataFrame()
+    return cast(pd.DataFrame, batch[ticker]).dropna(how="all")
 
-    # ---------- 4) Proxy indices if applicable ----------
-    proxy_map = {"^GSPC": "SPY", "^RUT": "IWM"}
-    proxy = proxy_map.get(ticker)
-    if proxy:
-        df_proxy = _yahoo_download(proxy, start=s, end=e, **kwargs)
-        if isinstance(df_proxy, pd.DataFrame) and not df_proxy.empty:
-            return FetchResult(_normalize_ohlcv(_to_datetime_index(df_proxy)), f"yahoo:{proxy}-proxy")
+# Upper bound on simultaneous Yahoo requests in a batched download
+MAX_CONCURRENT_DOWNLOADS = 8
 
-    # ---------- Nothing worked ----------
-    empty = pd.DataFrame(columns=["Open", "High", "Low", "Close", "Adj Close", "Volume"])
-    return FetchResult(empty, "empty")
+def download_price_data_many(
+    tickers: list[str],
+    max_workers: int = MAX_CONCURRENT_DOWNLOADS,
+    **kwargs: Any,
+) -> dict[str, FetchResult]:
+    """
+    Fetch OHLCV for several tickers at once.
 
+    Yahoo is queried with a single batched yfinance call, which issues the
+    per-ticker requests concurrently on its own thread pool (at most
+    `max_workers` in flight). Any ticker that comes back empty falls through
+    to the regular `download_price_data` chain.
+    Returns {ticker: FetchResult} keyed by the tickers exactly as given.
+    """
+    period = kwargs.pop("period", None)
+    start = kwargs.pop("start", None)
+    end = kwargs.pop("end", None)
+    kwargs.pop("threads", None)
+    kwargs.setdefault("progress", False)
+
+    results: dict[str, FetchResult] = {}
+    if not tickers:
+        return results
+
+    s, e = _weekend_safe_range(period, start, end)
+    misses: dict[str, str] = {}  # requested ticker -> canonical ticker
+    for t in tickers:
+        c = _canon_ticker(t)
+        cached = _cache_get(_cache_key(c, s, e, kwargs))
+        if cached is not None:
+            results[t] = cached
+        else:
+            misses[t] = c
+    if not misses:
+        return results
+
+    # Each distinct symbol is requested once even if several callers' rows name it
+    pending = list(dict.fromkeys(misses.values()))
+    workers = max(1, min(max_workers, len(pending)))
+    batch = _yahoo_download(pending, start=s, end=e, threads=workers, group_by="ticker", **kwargs)
+    fetched: dict[str, FetchResult] = {}
+    fallback: list[str] = []
+    for c in pending:
+        df_c = _batch_slice(batch, c)
+        if not df_c.empty:
+            fetched[c] = FetchResult(_normalize_ohlcv(_to_datetime_index(df_c)), "yahoo")
+            _cache_put(_cache_key(c, s, e, kwargs), fetched[c])
+        else:
+            fallback.append(c)
+
+    # Run the per-ticker fallback chains side by side rather than one after another
+    if fallback:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(fallback))) as pool:
+            chains = pool.map(lambda c: download_price_data(c, start=s, end=e, **kwargs), fallback)
+            fetched.update(zip(fallback, chains))
+
+    for t, c in misses.items():
+        results[t] = fetched[c]
+    return results
+
+
+def latest_quotes(tickers: list[str], **kwargs: Any) -> pd.DataFrame:
+    """
+    Return the last session's close, previous close, % change and volume per ticker.
+
+    One row per ticker (in input order) with float columns, so callers can do
+    vectorized math instead of walking per-ticker frames. Tickers with fewer
+    than two sessions of data get NaN.
+    """
+    fetched = download_price_data_many(tickers, **kwargs)
+    n = len(tickers)
+    close = np.full(n, np.nan)
+    prev_close = np.full(n, np.nan)
+    volume = np.full(n, np.nan)
+    for i, t in enumerate(tickers):
+        data = fetched[t].df
+        if len(data) >= 2:
+            close[i] = data["Close"].iloc[-1]
+            prev_close[i] = data["Close"].iloc[-2]
+            volume[i] = data["Volume"].iloc[-1]
+    return pd.DataFrame({
+        "ticker": tickers,
+        "close": close,
+        "prev_close": prev_close,
+        "pct_change": (close - prev_close) / prev_close * 100,
+        "volume": volume,
+    })
 
 
 # ------------------------------
@@ -422,16 +654,25 @@ def set_data_dir(data_dir: Path) -> None:
 # Portfolio operations
 # ------------------------------
 
+HOLDING_NUMERIC_COLS = ["shares", "stop_loss", "buy_price", "cost_basis"]
+
+def _coerce_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast holding columns to numbers once at ingest; unparseable values become NaN."""
+    for c in HOLDING_NUMERIC_COLS:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors="coerce")
+    return df
+
 def _ensure_df(portfolio: pd.DataFrame | dict[str, list[object]] | list[dict[str, object]]) -> pd.DataFrame:
     if isinstance(portfolio, pd.DataFrame):
-        return portfolio.copy()
+        return _coerce_numeric(portfolio.copy())
     if isinstance(portfolio, (dict, list)):
         df = pd.DataFrame(portfolio)
         # Ensure proper columns exist even for empty DataFrames
         if df.empty:
             logger.debug("Creating empty portfolio DataFrame with proper column structure")
             df = pd.DataFrame(columns=["ticker", "shares", "stop_loss", "buy_price", "cost_basis"])
-        return df
+        return _coerce_numeric(df)
     raise TypeError("portfolio must be a DataFrame, dict, or list[dict]")
 
 def process_portfolio(
@@ -500,19 +741,7 @@ Would you like to log a manual trade? Enter 'b' for buy, 's' for sell, or press
                         "Reason": "MANUAL BUY MOO - Filled",
                     }
                     # --- Manual BUY MOO logging ---
-                    if os.path.exists(TRADE_LOG_CSV):
-                        logger.info("Reading CSV file: %s", TRADE_LOG_CSV)
-                        df_log = pd.read_csv(TRADE_LOG_CSV)
-                        logger.info("Successfully read CSV file: %s", TRADE_LOG_CSV)
-                        if df_log.empty:
-                            df_log = pd.DataFrame([log])
-                        else:
-                            df_log = pd.concat([df_log, pd.DataFrame([log])], ignore_index=True)
-                    else:
-                        df_log = pd.DataFrame([log])
-                    logger.info("Writing CSV file: %s", TRADE_LOG_CSV)
-                    df_log.to_csv(TRADE_LOG_CSV, index=False)
-                    logger.info("Successfully wrote CSV file: %s", TRADE_LOG_CSV)
+                    _append_trade_log(log)
 
                     rows = portfolio_df.loc[portfolio_df["ticker"].astype(str).str.upper() == ticker.upper()]
                     if rows.empty:
@@ -588,14 +817,19 @@ Would you like to log a manual trade? Enter 'b' for buy, 's' for sell, or press
 
     # ------- Daily pricing + stop-loss execution -------
     s, e = trading_day_window()
-    for _, stock in portfolio_df.iterrows():
-        ticker = str(stock["ticker"]).upper()
-        shares = int(stock["shares"]) if not pd.isna(stock["shares"]) else 0
-        cost = float(stock["buy_price"]) if not pd.isna(stock["buy_price"]) else 0.0
-        cost_basis = float(stock["cost_basis"]) if not pd.isna(stock["cost_basis"]) else cost * shares
-        stop = float(stock["stop_loss"]) if not pd.isna(stock["stop_loss"]) else 0.0
-
-        fetch = download_price_data(ticker, start=s, end=e, auto_adjust=False, progress=False)
+    # Price every holding in one batched request up front
+    held = portfolio_df["ticker"].astype(str).str.upper().tolist()
+    fetched = download_price_data_many(held, start=s, end=e, auto_adjust=False, progress=False)
+    # Resolve missing values column-wise once instead of per-row isna checks
+    num = portfolio_df[HOLDING_NUMERIC_COLS].astype(float)
+    shares_col = num["shares"].fillna(0).astype(int)
+    cost_col = num["buy_price"].fillna(0.0)
+    basis_col = num["cost_basis"].fillna(cost_col * shares_col)
+    stop_col = num["stop_loss"].fillna(0.0)
+    for ticker, shares, cost, cost_basis, stop in zip(
+        held, shares_col.tolist(), cost_col.tolist(), basis_col.tolist(), stop_col.tolist()
+    ):
+        fetch = fetched[ticker]
         data = fetch.df
 
         if data.empty:
@@ -674,6 +908,33 @@ Would you like to log a manual trade? Enter 'b' for buy, 's' for sell, or press
 # Trade logging
 # ------------------------------
 
+def _append_trade_log(log: dict[str, object]) -> None:
+    """Append one trade row to TRADE_LOG_CSV without reloading the whole log.
+
+    Rows whose fields all fit the existing header are appended in place; a row
+    that introduces new columns falls back to rewriting the log with them.
+    """
+    row = pd.DataFrame([log])
+    if TRADE_LOG_CSV.exists() and TRADE_LOG_CSV.stat().st_size > 0:
+        header = pd.read_csv(TRADE_LOG_CSV, nrows=0).columns
+        if set(row.columns) <= set(header):
+            with TRADE_LOG_CSV.open("rb") as fh:
+                fh.seek(-1, os.SEEK_END)
+                missing_newline = fh.read(1) not in (b"\n", b"\r")
+            logger.info("Appending to CSV file: %s", TRADE_LOG_CSV)
+            with TRADE_LOG_CSV.open("a", newline="") as fh:
+                if missing_newline:
+                    fh.write("\n")
+                row.reindex(columns=header).to_csv(fh, header=False, index=False)
+            logger.info("Successfully appended to CSV file: %s", TRADE_LOG_CSV)
+            return
+        logger.info("Reading CSV file: %s", TRADE_LOG_CSV)
+        row = pd.concat([pd.read_csv(TRADE_LOG_CSV), row], ignore_index=True)
+        logger.info("Successfully read CSV file: %s", TRADE_LOG_CSV)
+    logger.info("Writing CSV file: %s", TRADE_LOG_CSV)
+    row.to_csv(TRADE_LOG_CSV, index=False)
+    logger.info("Successfully wrote CSV file: %s", TRADE_LOG_CSV)
+
 def log_sell(
     ticker: str,
     shares: float,
@@ -695,19 +956,7 @@ def log_sell(
     print(f"{ticker} stop loss was met. Selling all shares.")
     portfolio = portfolio[portfolio["ticker"] != ticker]
 
-    if TRADE_LOG_CSV.exists():
-        logger.info("Reading CSV file: %s", TRADE_LOG_CSV)
-        df = pd.read_csv(TRADE_LOG_CSV)
-        logger.info("Successfully read CSV file: %s", TRADE_LOG_CSV)
-        if df.empty:
-            df = pd.DataFrame([log])
-        else:
-            df = pd.concat([df, pd.DataFrame([log])], ignore_index=True)
-    else:
-        df = pd.DataFrame([log])
-    logger.info("Writing CSV file: %s", TRADE_LOG_CSV)
-    df.to_csv(TRADE_LOG_CSV, index=False)
-    logger.info("Successfully wrote CSV file: %s", TRADE_LOG_CSV)
+    _append_trade_log(log)
     return portfolio
 
 def log_manual_buy(
@@ -770,41 +1019,21 @@ def log_manual_buy(
         "PnL": 0.0,
         "Reason": "MANUAL BUY LIMIT - Filled",
     }
-    if os.path.exists(TRADE_LOG_CSV):
-        logger.info("Reading CSV file: %s", TRADE_LOG_CSV)
-        df = pd.read_csv(TRADE_LOG_CSV)
-        logger.info("Successfully read CSV file: %s", TRADE_LOG_CSV)
-        if df.empty:
-            df = pd.DataFrame([log])
-        else:
-            df = pd.concat([df, pd.DataFrame([log])], ignore_index=True)
-    else:
-        df = pd.DataFrame([log])
-    logger.info("Writing CSV file: %s", TRADE_LOG_CSV)
-    df.to_csv(TRADE_LOG_CSV, index=False)
-    logger.info("Successfully wrote CSV file: %s", TRADE_LOG_CSV)
+    _append_trade_log(log)
 
     rows = chatgpt_portfolio.loc[chatgpt_portfolio["ticker"].str.upper() == ticker.upper()]
     if rows.empty:
+        new_row = pd.DataFrame([{
+            "ticker": ticker,
+            "shares": float(shares),
+            "stop_loss": float(stoploss),
+            "buy_price": float(exec_price),
+            "cost_basis": float(cost_amt),
+        }])
         if chatgpt_portfolio.empty:
-            chatgpt_portfolio = pd.DataFrame([{
-                "ticker": ticker,
-                "shares": float(shares),
-                "stop_loss": float(stoploss),
-                "buy_price": float(exec_price),
-                "cost_basis": float(cost_amt),
-            }])
+            chatgpt_portfolio = new_row
         else:
-            chatgpt_portfolio = pd.concat(
-                [chatgpt_portfolio, pd.DataFrame([{
-                    "ticker": ticker,
-                    "shares": float(shares),
-                    "stop_loss": float(stoploss),
-                    "buy_price": float(exec_price),
-                    "cost_basis": float(cost_amt),
-                }])],
-                ignore_index=True
-            )
+            chatgpt_portfolio = pd.concat([chatgpt_portfolio, new_row], ignore_index=True)
     else:
         idx = rows.index[0]
         cur_shares = float(chatgpt_portfolio.at[idx, "shares"])
@@ -883,19 +1112,7 @@ If this is a mistake, enter 1, or hit Enter."""
         "Reason": f"MANUAL SELL LIMIT - {reason}", "Shares Sold": shares_sold,
         "Sell Price": exec_price,
     }
-    if os.path.exists(TRADE_LOG_CSV):
-        logger.info("Reading CSV file: %s", TRADE_LOG_CSV)
-        df = pd.read_csv(TRADE_LOG_CSV)
-        logger.info("Successfully read CSV file: %s", TRADE_LOG_CSV)
-        if df.empty:
-            df = pd.DataFrame([log])
-        else:
-            df = pd.concat([df, pd.DataFrame([log])], ignore_index=True)
-    else:
-        df = pd.DataFrame([log])
-    logger.info("Writing CSV file: %s", TRADE_LOG_CSV)
-    df.to_csv(TRADE_LOG_CSV, index=False)
-    logger.info("Successfully wrote CSV file: %s", TRADE_LOG_CSV)
+    _append_trade_log(log)
 
 
     if total_shares == shares_sold:
@@ -929,25 +1146,26 @@ def daily_results(chatgpt_portfolio: pd.DataFrame, cash: float) -> None:
     start_d = (end_d - pd.Timedelta(days=4)).normalize()  # go back enough to capture 2 sessions even around holidays
     
     benchmarks = load_benchmarks()  # reads tickers.json or returns defaults
-    benchmark_entries = [{"ticker": t} for t in benchmarks]
+    tickers = [str(stock["ticker"]).upper() for stock in portfolio_dict] + benchmarks
 
-    for stock in portfolio_dict + benchmark_entries:
-        ticker = str(stock["ticker"]).upper()
+    # One batched fetch for every row instead of a serial round-trip per ticker
+    try:
+        quotes = latest_quotes(tickers, start=start_d, end=(end_d + pd.Timedelta(days=1)), progress=False)
+    except Exception as e:
+        raise Exception(f"Download for {', '.join(tickers)} failed. {e} Try checking internet connection.")
+
+    missing: list[str] = []
+    for q in quotes.itertuples(index=False):
         try:
-            fetch = download_price_data(ticker, start=start_d, end=(end_d + pd.Timedelta(days=1)), progress=False)
-            data = fetch.df
-            if data.empty or len(data) < 2:
-                rows.append([ticker, "—", "—", "—"])
+            if np.isnan(q.close):
+                rows.append([q.ticker, "—", "—", "—"])
+                missing.append(q.ticker)
                 continue
-
-            price = float(data["Close"].iloc[-1])
-            last_price = float(data["Close"].iloc[-2])
-            volume = float(data["Volume"].iloc[-1])
-
-            percent_change = ((price - last_price) / last_price) * 100
-            rows.append([ticker, f"{price:,.2f}", f"{percent_change:+.2f}%", f"{int(volume):,}"])
+            rows.append([q.ticker, f"{q.close:,.2f}", f"{q.pct_change:+.2f}%", f"{int(q.volume):,}"])
         except Exception as e:
-            raise Exception(f"Download for {ticker} failed. {e} Try checking internet connection.")
+            raise Exception(f"Download for {q.ticker} failed. {e} Try checking internet connection.")
+    if missing:
+        logger.warning("No recent price data for: %s", ", ".join(missing))
 
     # Read portfolio history
     logger.info("Reading CSV file: %s", PORTFOLIO_CSV)
@@ -1074,14 +1292,9 @@ def daily_results(chatgpt_portfolio: pd.DataFrame, cash: float) -> None:
                 corr = np.corrcoef(x, y)[0, 1]
                 r2 = float(corr ** 2)
 
-    # $X normalized S&P 500 over same window (asks user for initial equity)
-    spx_norm_fetch = download_price_data(
-        "^GSPC",
-        start=equity_series.index.min(),
-        end=equity_series.index.max() + pd.Timedelta(days=1),
-        progress=False,
-    )
-    spx_norm = spx_norm_fetch.df
+    # $X normalized S&P 500 over same window (asks user for initial equity).
+    # The CAPM fetch above already covers this window, so slice it instead of downloading again.
+    spx_norm = spx_fetch.df.loc[spx_fetch.df.index >= equity_series.index.min().normalize()]
     spx_value = np.nan
     starting_equity = np.nan  # Ensure starting_equity is always defined
     if not spx_norm.empty:
@@ -1160,7 +1373,7 @@ def daily_results(chatgpt_portfolio: pd.DataFrame, cash: float) -> None:
 # Orchestration
 # ------------------------------
 
-def load_latest_portfolio_state() -> tuple[pd.DataFrame | list[dict[str, Any]], float]:
+def load_latest_portfolio_state() -> tuple[pd.DataFrame, float]:
     """Load the most recent portfolio snapshot and cash balance from global PORTFOLIO_CSV."""
     logger.info("Reading CSV file: %s", PORTFOLIO_CSV)
     try:
@@ -1216,7 +1429,10 @@ def load_latest_portfolio_state() -> tuple[pd.DataFrame | list[dict[str, Any]],
         },
         inplace=True,
     )
-    latest_tickers = latest_tickers.reset_index(drop=True).to_dict(orient="records")
+    # Keep the frame (no list-of-dicts round trip); fixed columns and numeric dtypes for callers
+    latest_tickers = _coerce_numeric(
+        latest_tickers.reindex(columns=["ticker", *HOLDING_NUMERIC_COLS]).reset_index(drop=True)
+    )
 
     df_total = df[df["Ticker"] == "TOTAL"].copy()
     df_total["Date"] = pd.to_datetime(df_total["Date"], format="mixed", errors="coerce")